@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -26,6 +27,9 @@ SECRET_KEY = os.environ.get('SECRET_KEY','changeme')
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = bool(int(os.environ.get('DEBUG',0)))
 
+# Running under `manage.py test` or pytest.
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+
 ALLOWED_HOSTS = []
 ALLOWED_HOSTS.extend(
     filter(
@@ -61,6 +65,17 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# The API views are csrf_exempt and the tests never look at the security
+# or clickjacking headers, so skip those middleware. The admin's system
+# checks require the session, auth and messages middleware to stay.
+if TESTING:
+    MIDDLEWARE = [
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    ]
+
 ROOT_URLCONF = 'app.urls'
 
 TEMPLATES = [
@@ -95,6 +110,14 @@ DATABASES = {
     }
 }
 
+# The tests don't rely on anything Postgres-specific, and an in-memory
+# SQLite database avoids the round-trips to the db container.
+if TESTING:
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -115,6 +138,13 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# The default PBKDF2 hasher is deliberately slow; tests don't need that.
+if TESTING:
+    PASSWORD_HASHERS = [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
 
@@ -152,3 +182,14 @@ REST_FRAMEWORK = {
 SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST' : True,
 }
+
+# django.request logs every 4xx response as a warning and the tests
+# provoke plenty of those on purpose, so only let errors through.
+if TESTING:
+    LOGGING = {
+        'version': 1,
+        'disable_existing_loggers': False,
+        'loggers': {
+            'django.request': {'level': 'ERROR'},
+        },
+    }
@@ -0,0 +1,38 @@
+"""
+Shared serializer helpers.
+"""
+import copy
+
+from rest_framework import serializers
+
+
+class CachedFieldsSerializerMixin:
+    """Build a serializer's fields once per class instead of per instance.
+
+    ModelSerializer introspects the model and deep-copies every declared
+    field each time a serializer is instantiated. The result only depends
+    on the class, so keep it and hand each instance shallow copies. Nested
+    serializers and fields wrapping a child field (many=True relations,
+    ListField, DictField) are still deep-copied so their children bind to
+    this instance too.
+    """
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        if cls not in self._fields_cache:
+            self._fields_cache[cls] = super().get_fields()
+        return {
+            name: copy.deepcopy(field)
+            if _has_bound_children(field)
+            else copy.copy(field)
+            for name, field in self._fields_cache[cls].items()
+        }
+
+
+def _has_bound_children(field):
+    return (
+        isinstance(field, serializers.BaseSerializer)
+        or hasattr(field, 'child')
+        or hasattr(field, 'child_relation')
+    )
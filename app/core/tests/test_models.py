@@ -1,14 +1,12 @@
 from unittest.mock import patch
 from decimal import Decimal
 
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
 
 from core import models
 
-
-def create_user(email='test@example.com', password='testpass123'):
-    return get_user_model().objects.create_user(email, password)
+User = get_user_model()
 
 
 class ModelTests(TestCase):
@@ -16,7 +14,7 @@ class ModelTests(TestCase):
     def test_create_user_with_email_success(self):
         email = "test@example.com"
         password = "test@123"
-        user = get_user_model().objects.create_user(
+        user = User.objects.create_user(
             email=email,
             password=password,
         )
@@ -30,18 +28,14 @@ class ModelTests(TestCase):
             ["Test2@ExampLe.com", "Test2@example.com"],
         ]
         for email, expected in sample_emails:
-            user = get_user_model().objects.create_user(email, "sample123")
-            self.assertEqual(user.email, expected)
-
-    def test_new_user_email_empty(self):
-        with self.assertRaises(ValueError):
-            get_user_model().objects \
-                .create_user(email='', password='simple123')
+            with self.subTest(email=email):
+                user = User.objects.create_user(email, password=None)
+                self.assertEqual(user.email, expected)
 
     def test_create_superuser(self):
         email = "test@example.com"
         password = "test@123"
-        user = get_user_model().objects.create_superuser(
+        user = User.objects.create_superuser(
             email=email,
             password=password,
         )
@@ -51,13 +45,19 @@ class ModelTests(TestCase):
         self.assertTrue(user.is_superuser)
         self.assertTrue(user.is_staff)
 
+
+class UnsavedModelTests(SimpleTestCase):
+
+    def setUp(self):
+        self.user = User(email='user@example.com')
+
+    def test_new_user_email_empty(self):
+        with self.assertRaises(ValueError):
+            User.objects.create_user(email='', password='simple123')
+
     def test_create_recipe(self):
-        user = get_user_model().objects.create_user(
-            'test@example.com',
-            'testpass@123',
-        )
-        recipe = models.Recipe.objects.create(
-            user=user,
+        recipe = models.Recipe(
+            user=self.user,
             title='sample recipe name',
             time_minutes=5,
             price=Decimal('5.50'),
@@ -66,15 +66,12 @@ class ModelTests(TestCase):
         self.assertEqual(str(recipe), recipe.title)
 
     def test_create_tag(self):
-        user = create_user()
-        tag = models.Tag.objects.create(user=user, name='Tag1')
+        tag = models.Tag(user=self.user, name='Tag1')
 
         self.assertEqual(str(tag), tag.name)
 
     def test_create_ingredient(self):
-        user = create_user()
-        ingredient = models.Ingredient.objects.create(
-            user=user, name='Ingredient1')
+        ingredient = models.Ingredient(user=self.user, name='Ingredient1')
 
         self.assertEqual(str(ingredient), ingredient.name)
 
@@ -0,0 +1,89 @@
+"""
+Tests for shared serializer helpers.
+"""
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from rest_framework import serializers
+
+from core.models import (
+    Recipe,
+    Tag,
+)
+from core.serializers import CachedFieldsSerializerMixin
+from recipe.serializers import (
+    RECIPE_LIST_FIELDS,
+    RecipeSerializer,
+)
+
+
+class RecipeTagIdsSerializer(CachedFieldsSerializerMixin,
+                             serializers.ModelSerializer):
+
+    class Meta:
+        model = Recipe
+        fields = ['id', 'tags']
+
+
+class CachedFieldsSerializerMixinTests(SimpleTestCase):
+    """Test caching serializer fields per class."""
+
+    def test_fields_built_once_per_class(self):
+        """Test ModelSerializer.get_fields runs once for two instances."""
+        class FreshTagSerializer(CachedFieldsSerializerMixin,
+                                 serializers.ModelSerializer):
+
+            class Meta:
+                model = Tag
+                fields = ['id', 'name']
+
+        get_fields = serializers.ModelSerializer.get_fields
+        with mock.patch.object(
+            serializers.ModelSerializer, 'get_fields',
+            autospec=True, side_effect=get_fields,
+        ) as mock_get_fields:
+            first = FreshTagSerializer()
+            second = FreshTagSerializer()
+            first.fields
+            second.fields
+
+        mock_get_fields.assert_called_once()
+        self.assertEqual(list(second.fields), ['id', 'name'])
+
+    def test_fields_not_shared_between_instances(self):
+        """Test each instance gets its own field objects."""
+        first = RecipeSerializer()
+        second = RecipeSerializer()
+
+        self.assertEqual(
+            list(first.fields), RECIPE_LIST_FIELDS + ['tags', 'ingredients'])
+        for name in first.fields:
+            self.assertIsNot(first.fields[name], second.fields[name])
+            self.assertIs(first.fields[name].parent, first)
+            self.assertIs(second.fields[name].parent, second)
+
+    def test_nested_serializer_uses_own_root(self):
+        """Test nested serializers see their own parent's context."""
+        first = RecipeSerializer(context={'request': 'first'})
+        second = RecipeSerializer(context={'request': 'second'})
+
+        self.assertIs(first.fields['tags'].child.root, first)
+        self.assertEqual(
+            first.fields['tags'].child.context, {'request': 'first'})
+        self.assertEqual(
+            second.fields['tags'].child.context, {'request': 'second'})
+
+    def test_many_related_field_uses_own_root(self):
+        """Test primary key m2m fields bind their child per instance."""
+        first = RecipeTagIdsSerializer(context={'request': 'first'})
+        second = RecipeTagIdsSerializer(context={'request': 'second'})
+
+        first_child = first.fields['tags'].child_relation
+        second_child = second.fields['tags'].child_relation
+        self.assertIsInstance(
+            first.fields['tags'], serializers.ManyRelatedField)
+        self.assertIsNot(first_child, second_child)
+        self.assertIs(first_child.root, first)
+        self.assertEqual(first_child.context, {'request': 'first'})
+        self.assertEqual(second_child.context, {'request': 'second'})
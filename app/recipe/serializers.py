@@ -5,9 +5,14 @@ from core.models import (
     Tag,
     Ingredient,
 )
+from core.serializers import CachedFieldsSerializerMixin
 
+# Recipe columns rendered by RecipeSerializer (the list view).
+RECIPE_LIST_FIELDS = ['id', 'title', 'time_minutes', 'price', 'link']
 
-class IngredientSerializer(serializers.ModelSerializer):
+
+class IngredientSerializer(CachedFieldsSerializerMixin,
+                           serializers.ModelSerializer):
 
     class Meta:
         model = Ingredient
@@ -15,7 +20,8 @@ class IngredientSerializer(serializers.ModelSerializer):
         read_only = ['id']
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(CachedFieldsSerializerMixin,
+                    serializers.ModelSerializer):
 
     class Meta:
         model = Tag
@@ -23,34 +29,36 @@ class TagSerializer(serializers.ModelSerializer):
         read_only = ['id']
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(CachedFieldsSerializerMixin,
+                       serializers.ModelSerializer):
 
     tags = TagSerializer(many=True, required=False)
     ingredients = IngredientSerializer(many=True, required=False)
 
     class Meta:
         model = Recipe
-        fields = ['id', 'title', 'time_minutes', 'price', 'link', 'tags',
-                  'ingredients']
+        fields = RECIPE_LIST_FIELDS + ['tags', 'ingredients']
         read_only_fields = ['id']
 
-    def _get_or_create_tags(self, tags, recipe):
+    def _get_or_create_by_name(self, model, items, related_manager):
+        if not items:
+            return
         auth_user = self.context['request'].user
-        for tag in tags:
-            tag_obj, created = Tag.objects.get_or_create(
-                user=auth_user,
-                **tag,
-            )
-            recipe.tags.add(tag_obj)
+        names = list(dict.fromkeys(item['name'] for item in items))
+        objs = model.objects.filter(user=auth_user, name__in=names)
+        existing = set(objs.values_list('name', flat=True))
+        model.objects.bulk_create([
+            model(user=auth_user, name=name)
+            for name in names if name not in existing
+        ])
+        related_manager.add(*objs.values_list('id', flat=True))
+
+    def _get_or_create_tags(self, tags, recipe):
+        self._get_or_create_by_name(Tag, tags, recipe.tags)
 
     def _get_or_create_ingredients(self, ingredients, recipe):
-        auth_user = self.context['request'].user
-        for ingredient in ingredients:
-            ingredient_obj, created = Ingredient.objects.get_or_create(
-                user=auth_user,
-                **ingredient,
-            )
-            recipe.ingredients.add(ingredient_obj)
+        self._get_or_create_by_name(
+            Ingredient, ingredients, recipe.ingredients)
 
     def create(self, validated_data):
         tags = validated_data.pop('tags', [])
@@ -1,7 +1,7 @@
 from decimal import Decimal
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -13,19 +13,22 @@ from core.models import (
 
 from recipe.serializers import IngredientSerializer
 
+User = get_user_model()
 
 INGREDIENT_URL = reverse('recipe:ingredient-list')
+_INGREDIENT_DETAIL_TMPL = reverse(
+    'recipe:ingredient-detail', args=[0]).replace('/0/', '/{}/')
 
 
 def detail_url(ingredient_id):
-    return reverse('recipe:ingredient-detail', args=[ingredient_id])
+    return _INGREDIENT_DETAIL_TMPL.format(ingredient_id)
 
 
 def create_user(email='test@example.com', password='test123'):
-    return get_user_model().objects.create_user(email=email, password=password)
+    return User.objects.create_user(email=email, password=password)
 
 
-class PublicIngredientAPITests(TestCase):
+class PublicIngredientAPITests(SimpleTestCase):
 
     def setUp(self):
         self.client = APIClient()
@@ -38,34 +41,42 @@ class PublicIngredientAPITests(TestCase):
 
 class PrivateIngredientAPITests(TestCase):
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
         self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_ingredients(self):
-        Ingredient.objects.create(name='ing1', user=self.user)
-        Ingredient.objects.create(name='ing2', user=self.user)
+        Ingredient.objects.bulk_create([
+            Ingredient(name='ing1', user=self.user),
+            Ingredient(name='ing2', user=self.user),
+        ])
 
-        res = self.client.get(INGREDIENT_URL)
+        with self.assertNumQueries(1):
+            res = self.client.get(INGREDIENT_URL)
         ingredients = Ingredient.objects.all().order_by('-name')
-        serializer = IngredientSerializer(ingredients, many=True)
+        expected = list(ingredients.values('id', 'name'))
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data, expected)
 
     def test_retieve_limited_user(self):
         other_user = create_user(email='test2@example.com')
-        Ingredient.objects.create(name='ing1', user=self.user)
-        Ingredient.objects.create(name='ing2', user=other_user)
+        Ingredient.objects.bulk_create([
+            Ingredient(name='ing1', user=self.user),
+            Ingredient(name='ing2', user=other_user),
+        ])
 
         res = self.client.get(INGREDIENT_URL)
         ingredients = Ingredient.objects.filter(
             user=self.user).order_by('-name')
-        serializer = IngredientSerializer(ingredients, many=True)
+        expected = list(ingredients.values('id', 'name'))
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data, expected)
 
     def test_update_ingredient(self):
         ingredient = Ingredient.objects.create(name='ing1', user=self.user)
@@ -75,7 +86,7 @@ class PrivateIngredientAPITests(TestCase):
         res = self.client.patch(url, payload)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        ingredient.refresh_from_db()
+        ingredient.refresh_from_db(fields=['name'])
         self.assertIn(ingredient.name, payload['name'])
 
     def test_delete_ingredient(self):
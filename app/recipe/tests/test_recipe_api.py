@@ -1,11 +1,14 @@
-import tempfile
+import io
 import os
 from decimal import Decimal
 
 from PIL import Image
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
@@ -18,40 +21,65 @@ from core.models import (
 )
 
 from recipe.serializers import (
+    RECIPE_LIST_FIELDS,
     RecipeSerializer,
     RecipeDetailSerializer,
 )
 
+User = get_user_model()
+
 RECIPES_URL = reverse('recipe:recipe-list')
 
+_RECIPE_DETAIL_TMPL = reverse(
+    'recipe:recipe-detail', args=[0]).replace('/0/', '/{}/')
+_IMAGE_UPLOAD_TMPL = reverse(
+    'recipe:recipe-upload-image', args=[0]).replace('/0/', '/{}/')
+
 
 def detail_url(recipe_id):
-    return reverse('recipe:recipe-detail', args=[recipe_id])
+    return _RECIPE_DETAIL_TMPL.format(recipe_id)
 
 
 def image_upload_url(recipe_id):
-    return reverse('recipe:recipe-upload-image', args=[recipe_id])
+    return _IMAGE_UPLOAD_TMPL.format(recipe_id)
+
+
+_RECIPE_DEFAULTS = {
+    'title': 'sample recipe title',
+    'time_minutes': 22,
+    'price': Decimal('5.25'),
+    'description': 'sample recipe description',
+    'link': 'http://example.com/recipe.pdf',
+}
+
+
+def build_recipe(user, **params):
+    return Recipe(user=user, **{**_RECIPE_DEFAULTS, **params})
 
 
 def create_recipe(user, **params):
-    defaults = {
-        'title': 'sample recipe title',
-        'time_minutes': 22,
-        'price': Decimal('5.25'),
-        'description': 'sample recipe description',
-        'link': 'http://example.com/recipe.pdf',
-    }
-    defaults.update(params)
+    return Recipe.objects.create(user=user, **{**_RECIPE_DEFAULTS, **params})
+
 
-    recipe = Recipe.objects.create(user=user, **defaults)
-    return recipe
+def recipe_list_values(data):
+    rows = [{field: item[field] for field in RECIPE_LIST_FIELDS}
+            for item in data]
+    for row in rows:
+        row['price'] = Decimal(row['price'])
+    return rows
+
+
+def _make_jpeg_bytes():
+    buf = io.BytesIO()
+    Image.new('RGB', (10, 10)).save(buf, format='JPEG')
+    return buf.getvalue()
 
 
 def create_user(**params):
-    return get_user_model().objects.create_user(**params)
+    return User.objects.create_user(**params)
 
 
-class PublicRecipeAPITests(TestCase):
+class PublicRecipeAPITests(SimpleTestCase):
 
     def setUp(self):
         self.client = APIClient()
@@ -63,38 +91,58 @@ class PublicRecipeAPITests(TestCase):
 
 class PrivateRecipeAPITests(TestCase):
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(
+            email='test@example.com', password='testpass123')
+        cls.karthik_tag = Tag.objects.create(name='karthik', user=cls.user)
+
     def setUp(self):
         self.client = APIClient()
-        self.user = create_user(
-            email='test@example.com', password='testpass123')
         self.client.force_authenticate(self.user)
 
     def test_retrieve_recipes(self):
-        create_recipe(user=self.user)
-        create_recipe(user=self.user)
+        Recipe.objects.bulk_create([
+            build_recipe(user=self.user),
+            build_recipe(user=self.user),
+        ])
 
-        res = self.client.get(RECIPES_URL)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPES_URL)
 
-        recipes = Recipe.objects.all().order_by('-id')
-        serializer = RecipeSerializer(recipes, many=True)
+        recipes = Recipe.objects.filter(user=self.user).order_by('-id')
+        expected = list(recipes.values(*RECIPE_LIST_FIELDS))
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(recipe_list_values(res.data), expected)
+
+    def test_retrieve_recipes_skips_detail_columns(self):
+        create_recipe(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('description', queries[0]['sql'])
+        self.assertNotIn('image', queries[0]['sql'])
 
     def test_recipe_limited_user(self):
         other_user = create_user(
             email='test1@example.com', password='testpass123')
 
-        create_recipe(user=other_user)
-        create_recipe(user=self.user)
+        Recipe.objects.bulk_create([
+            build_recipe(user=other_user),
+            build_recipe(user=self.user),
+        ])
 
-        res = self.client.get(RECIPES_URL)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPES_URL)
 
-        recipes = Recipe.objects.filter(user=self.user)
-        serializer = RecipeSerializer(recipes, many=True)
+        expected_ids = list(Recipe.objects.filter(
+            user=self.user).order_by('-id').values_list('id', flat=True))
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual([r['id'] for r in res.data], expected_ids)
 
     def test_get_recipe_detail(self):
         recipe = create_recipe(user=self.user)
@@ -138,13 +186,14 @@ class PrivateRecipeAPITests(TestCase):
 
         url = detail_url(recipe.id)
 
-        res = self.client.patch(url, payload)
+        with self.assertNumQueries(4):
+            res = self.client.patch(url, payload)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        self.assertEqual(recipe.title, payload['title'])
-        self.assertEqual(recipe.link, original_link)
-        self.assertEqual(recipe.user, self.user)
+        self.assertEqual(res.data['title'], payload['title'])
+        self.assertEqual(res.data['link'], original_link)
+        recipe.refresh_from_db(fields=['user'])
+        self.assertEqual(recipe.user_id, self.user.id)
 
     def test_full_update(self):
         recipe = create_recipe(
@@ -164,11 +213,9 @@ class PrivateRecipeAPITests(TestCase):
         url = detail_url(recipe.id)
         res = self.client.put(url, payload)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
 
-        for k, v in payload.items():
-            self.assertEqual(getattr(recipe, k), v)
-        self.assertEqual(recipe.user, self.user)
+        row = Recipe.objects.values('user', *payload).get(pk=recipe.pk)
+        self.assertEqual(row, {**payload, 'user': self.user.id})
 
     def test_update_error(self):
         other_user = create_user(
@@ -181,17 +228,18 @@ class PrivateRecipeAPITests(TestCase):
         }
 
         url = detail_url(recipe.id)
-        self.client.patch(url, payload)
-        recipe.refresh_from_db()
-        self.assertEqual(recipe.title, payload['title'])
-        self.assertEqual(recipe.user, self.user)
+        res = self.client.patch(url, payload)
+        self.assertEqual(res.data['title'], payload['title'])
+        recipe.refresh_from_db(fields=['user'])
+        self.assertEqual(recipe.user_id, self.user.id)
 
     def test_delete_recipe(self):
         recipe = create_recipe(user=self.user)
 
         url = detail_url(recipe.id)
 
-        res = self.client.delete(url)
+        with self.assertNumQueries(4):
+            res = self.client.delete(url)
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Recipe.objects.filter(id=recipe.id).exists())
 
@@ -205,104 +253,106 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEquals(res.status_code, status.HTTP_404_NOT_FOUND)
         self.assertTrue(Recipe.objects.filter(id=recipe.id).exists())
 
-    def test_create_recipe_with_new_tag(self):
-        payload = {
-            'title': 'sample recipe title',
-            'time_minutes': 20,
-            'price': Decimal('4.50'),
-            'tags': [{'name': 'karthik'}, {'name': 'perisetti'}]
-        }
-
-        res = self.client.post(RECIPES_URL, payload, format='json')
-        recipes = Recipe.objects.filter(user=self.user)
-
-        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(recipes.count(), 1)
-        recipe = recipes[0]
-        self.assertEqual(recipe.tags.count(), 2)
-        for tag in payload['tags']:
-            self.assertTrue(recipe.tags.filter(
-                user=self.user,
-                name=tag['name'],
-            ).exists())
-
-    def test_create_recipe_with_existing_tag(self):
-        karthik_tag = Tag.objects.create(name='karthik', user=self.user)
-        payload = {
-            'title': 'sample recipe title',
-            'time_minutes': 20,
-            'price': Decimal('4.50'),
-            'tags': [{'name': 'karthik'}, {'name': 'perisetti'}]
-        }
-
-        res = self.client.post(RECIPES_URL, payload, format='json')
-        recipes = Recipe.objects.filter(user=self.user)
-
-        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(recipes.count(), 1)
-        recipe = recipes[0]
-        self.assertEqual(recipe.tags.count(), 2)
-        self.assertIn(karthik_tag, recipe.tags.all())
+    def test_create_recipe_with_tags(self):
+        cases = [
+            # Both tags are new.
+            [{'name': 'breakfast'}, {'name': 'dinner'}],
+            # 'karthik' already exists and must be reused.
+            [{'name': 'karthik'}, {'name': 'perisetti'}],
+        ]
+        for tags in cases:
+            # Roll each case back so it starts from setUpTestData alone.
+            with self.subTest(tags=tags), transaction.atomic():
+                self.assertEqual(
+                    list(Tag.objects.filter(user=self.user)
+                         .values_list('name', flat=True)),
+                    ['karthik'],
+                )
+                payload = {
+                    'title': 'sample recipe title',
+                    'time_minutes': 20,
+                    'price': Decimal('4.50'),
+                    'tags': tags,
+                }
+
+                res = self.client.post(RECIPES_URL, payload, format='json')
+
+                self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+                recipe = Recipe.objects.get(id=res.data['id'])
+                self.assertEqual(recipe.user, self.user)
+                names = {tag['name'] for tag in tags}
+                self.assertEqual(
+                    set(recipe.tags.filter(user=self.user)
+                        .values_list('name', flat=True)),
+                    names,
+                )
+                self.assertEqual(
+                    Tag.objects.filter(user=self.user, name__in=names)
+                    .count(),
+                    len(names),
+                )
+                transaction.set_rollback(True)
+
+    def test_create_recipe_tag_queries_independent_of_count(self):
+        query_counts = []
+        for names in [['lunch'], ['karthik', 'dinner', 'snack', 'vegan']]:
+            payload = {
+                'title': 'sample recipe title',
+                'time_minutes': 20,
+                'price': Decimal('4.50'),
+                'tags': [{'name': name} for name in names],
+            }
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(RECIPES_URL, payload, format='json')
+
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
 
     def test_create_tag_on_update(self):
         recipe = create_recipe(user=self.user)
 
-        payload = {'tags': [{'name': 'karthik'}]}
-        url = detail_url(recipe.id)
-        res = self.client.patch(url, payload, format='json')
-
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        tag = Tag.objects.get(user=self.user, name='karthik')
-        self.assertIn(tag, recipe.tags.all())
-
-    def test_update_recipe_assign_tag(self):
-        karthik_tag = Tag.objects.create(name='karthik', user=self.user)
-        recipe = create_recipe(user=self.user)
-        recipe.tags.add(karthik_tag)
-
-        payload = {'tags': [{'name': 'karthik'}, {'name': 'perisetti'}]}
-        url = detail_url(recipe.id)
-        res = self.client.patch(url, payload, format='json')
-
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        self.assertEquals(recipe.tags.count(), 2)
-        tag = Tag.objects.get(user=self.user, name='karthik')
-        self.assertIn(tag, recipe.tags.all())
-        tag = Tag.objects.get(user=self.user, name='perisetti')
-        self.assertIn(tag, recipe.tags.all())
-
-    def test_update_recipe_replace_tag(self):
-        karthik_tag = Tag.objects.create(name='karthik', user=self.user)
-        recipe = create_recipe(user=self.user)
-        recipe.tags.add(karthik_tag)
-
-        payload = {'tags': [{'name': 'perisetti'}]}
-        url = detail_url(recipe.id)
-        res = self.client.patch(url, payload, format='json')
-
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        self.assertEquals(recipe.tags.count(), 1)
-        tag = Tag.objects.get(user=self.user, name='karthik')
-        self.assertNotIn(tag, recipe.tags.all())
-        tag = Tag.objects.get(user=self.user, name='perisetti')
-        self.assertIn(tag, recipe.tags.all())
-
-    def test_clear_recipe_tags(self):
-        karthik_tag = Tag.objects.create(name='karthik', user=self.user)
-        recipe = create_recipe(user=self.user)
-        recipe.tags.add(karthik_tag)
-
-        payload = {'tags': []}
-
+        payload = {'tags': [{'name': 'lunch'}]}
         url = detail_url(recipe.id)
         res = self.client.patch(url, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        self.assertEqual(recipe.tags.count(), 0)
+        tag = Tag.objects.get(user=self.user, name='lunch')
+        self.assertIn({'id': tag.id, 'name': tag.name}, res.data['tags'])
+
+    def test_update_recipe_tags(self):
+        cases = [
+            # Assign a new tag alongside the existing one.
+            ([{'name': 'karthik'}, {'name': 'perisetti'}],
+             {'karthik', 'perisetti'}),
+            # Replace the existing tag with a tag that does not exist yet.
+            ([{'name': 'perisetti'}], {'perisetti'}),
+            # Clear all tags.
+            ([], set()),
+        ]
+        for tags, expected_names in cases:
+            # Roll each case back so it starts from setUpTestData alone.
+            with self.subTest(tags=tags), transaction.atomic():
+                self.assertEqual(
+                    list(Tag.objects.filter(user=self.user)
+                         .values_list('name', flat=True)),
+                    ['karthik'],
+                )
+                recipe = create_recipe(user=self.user)
+                recipe.tags.add(self.karthik_tag)
+
+                payload = {'tags': tags}
+                url = detail_url(recipe.id)
+                res = self.client.patch(url, payload, format='json')
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    set(recipe.tags.filter(user=self.user)
+                        .values_list('name', flat=True)),
+                    expected_names,
+                )
+                transaction.set_rollback(True)
 
     """Tests for Ingredients"""
 
@@ -319,13 +369,9 @@ class PrivateRecipeAPITests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         self.assertEqual(recipes.count(), 1)
-        recipe = recipes[0]
-        self.assertEqual(recipe.ingredients.count(), 2)
-        for ingredient in payload['ingredients']:
-            self.assertTrue(recipe.ingredients.filter(
-                user=self.user,
-                name=ingredient['name'],
-            ).exists())
+        names = set(recipes[0].ingredients.filter(
+            user=self.user).values_list('name', flat=True))
+        self.assertEqual(names, {'karthik', 'perisetti'})
 
     def test_create_recipe_with_existing_ingredient(self):
         karthik_ingredient = Ingredient.objects.create(
@@ -354,9 +400,9 @@ class PrivateRecipeAPITests(TestCase):
         res = self.client.patch(url, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        ingredient = Ingredient.objects.get(user=self.user, name='karthik')
-        self.assertIn(ingredient, recipe.ingredients.all())
+        names = set(recipe.ingredients.filter(
+            user=self.user).values_list('name', flat=True))
+        self.assertEqual(names, {'karthik'})
 
     def test_update_recipe_assign_ingredient(self):
         karthik_ingredient = Ingredient.objects.create(
@@ -369,12 +415,9 @@ class PrivateRecipeAPITests(TestCase):
         res = self.client.patch(url, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        self.assertEqual(recipe.ingredients.count(), 2)
-        ingredient = Ingredient.objects.get(user=self.user, name='karthik')
-        self.assertIn(ingredient, recipe.ingredients.all())
-        ingredient = Ingredient.objects.get(user=self.user, name='perisetti')
-        self.assertIn(ingredient, recipe.ingredients.all())
+        names = set(recipe.ingredients.filter(
+            user=self.user).values_list('name', flat=True))
+        self.assertEqual(names, {'karthik', 'perisetti'})
 
     def test_update_recipe_replace_ingredient(self):
         karthik_ingredient = Ingredient.objects.create(
@@ -387,12 +430,9 @@ class PrivateRecipeAPITests(TestCase):
         res = self.client.patch(url, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        self.assertEqual(recipe.ingredients.count(), 1)
-        ingredient = Ingredient.objects.get(user=self.user, name='karthik')
-        self.assertNotIn(ingredient, recipe.ingredients.all())
-        ingredient = Ingredient.objects.get(user=self.user, name='perisetti')
-        self.assertIn(ingredient, recipe.ingredients.all())
+        names = set(recipe.ingredients.filter(
+            user=self.user).values_list('name', flat=True))
+        self.assertEqual(names, {'perisetti'})
 
     def test_clear_recipe_ingredients(self):
         karthik_ingredient = Ingredient.objects.create(
@@ -406,7 +446,6 @@ class PrivateRecipeAPITests(TestCase):
         res = self.client.patch(url, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
         self.assertEqual(recipe.ingredients.count(), 0)
 
     def test_filter_by_tags(self):
@@ -453,15 +492,47 @@ class PrivateRecipeAPITests(TestCase):
         self.assertIn(serializer2.data, res.data)
         self.assertNotIn(serializer3.data, res.data)
 
+    def test_filter_by_tags_and_ingredients(self):
+        recipe1 = create_recipe(user=self.user, title='chicken')
+        recipe2 = create_recipe(user=self.user, title='mutton')
+        tag = Tag.objects.create(user=self.user, name='lunch')
+        ingredient = Ingredient.objects.create(
+            user=self.user, name='chicken rice')
+        recipe1.tags.add(tag)
+        recipe1.ingredients.add(ingredient)
+        recipe2.ingredients.add(ingredient)
+
+        payload = {'tags': f'{tag.id}', 'ingredients': f'{ingredient.id}'}
+        res = self.client.get(RECIPES_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['id'] for r in res.data], [recipe1.id])
+
+    def test_filter_by_tags_unique(self):
+        recipe = create_recipe(user=self.user)
+        tag1 = Tag.objects.create(user=self.user, name='breakfast')
+        tag2 = Tag.objects.create(user=self.user, name='lunch')
+        recipe.tags.add(tag1, tag2)
+
+        payload = {'tags': f'{tag1.id},{tag2.id}'}
+        res = self.client.get(RECIPES_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+
 
 class ImageUploadTests(TestCase):
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(
+            email='test@example.com', password='testpass123')
+        cls.recipe = create_recipe(user=cls.user)
+        cls.jpeg_bytes = _make_jpeg_bytes()
+
     def setUp(self):
         self.client = APIClient()
-        self.user = create_user(
-            email='test@example.com', password='testpass123')
         self.client.force_authenticate(self.user)
-        self.recipe = create_recipe(user=self.user)
 
     def tearDown(self):
         self.recipe.image.delete()
@@ -469,14 +540,12 @@ class ImageUploadTests(TestCase):
     def test_upload_image(self):
 
         url = image_upload_url(self.recipe.id)
-        with tempfile.NamedTemporaryFile(suffix='.jpg') as image_file:
-            img = Image.new('RGB', (10, 10))
-            img.save(image_file, format='JPEG')
-            image_file.seek(0)
-            payload = {'image': image_file}
-            res = self.client.post(url, payload, format='multipart')
-
-        self.recipe.refresh_from_db()
+        image_file = SimpleUploadedFile(
+            'image.jpg', self.jpeg_bytes, content_type='image/jpeg')
+        payload = {'image': image_file}
+        res = self.client.post(url, payload, format='multipart')
+
+        self.recipe.refresh_from_db(fields=['image'])
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertIn('image', res.data)
         self.assertTrue(os.path.exists(self.recipe.image.path))
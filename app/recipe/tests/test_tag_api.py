@@ -1,7 +1,7 @@
 from decimal import Decimal
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -14,17 +14,19 @@ from core.models import (
 from recipe.serializers import TagSerializer
 
 TAGS_URL = reverse('recipe:tag-list')
+_TAG_DETAIL_TMPL = reverse(
+    'recipe:tag-detail', args=[0]).replace('/0/', '/{}/')
 
 
 def detail_url(tag_id):
-    return reverse('recipe:tag-detail', args=[tag_id])
+    return _TAG_DETAIL_TMPL.format(tag_id)
 
 
 def create_user(email='test@example.com', password='testpass123'):
     return get_user_model().objects.create_user(email=email, password=password)
 
 
-class PublicTagsAPITests(TestCase):
+class PublicTagsAPITests(SimpleTestCase):
 
     def setUp(self):
         self.client = APIClient()
@@ -36,8 +38,11 @@ class PublicTagsAPITests(TestCase):
 
 class privateTagsAPITests(TestCase):
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
         self.client = APIClient()
         self.client.force_authenticate(self.user)
 
@@ -48,10 +53,10 @@ class privateTagsAPITests(TestCase):
         res = self.client.get(TAGS_URL)
 
         tags = Tag.objects.all().order_by('-name')
-        serializer = TagSerializer(tags, many=True)
+        expected = list(tags.values('id', 'name'))
 
         self.assertEquals(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data, expected)
 
     def test_tags_limited_to_user(self):
         user2 = create_user(email='test1@example.com')
@@ -74,7 +79,7 @@ class privateTagsAPITests(TestCase):
         res = self.client.patch(url, payload)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        tag.refresh_from_db()
+        tag.refresh_from_db(fields=['name'])
         self.assertEqual(tag.name, payload['name'])
 
     def test_delete_tag(self):
@@ -1,3 +1,9 @@
+from django.db.models import (
+    Exists,
+    OuterRef,
+    Prefetch,
+)
+
 from drf_spectacular.utils import (
     extend_schema_view,
     extend_schema,
@@ -44,31 +50,42 @@ class RecipeViewSet(viewsets.ModelViewSet):
     queryset = Recipe.objects.all()
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
+    _serializer_map = {
+        'list': serializers.RecipeSerializer,
+        'upload_image': serializers.RecipeImageSerializer,
+    }
 
     def _params_to_ints(self, qs):
-        return [int(str_id) for str_id in qs.split(',')]
+        return [int(str_id) for str_id in qs.split(',') if str_id]
 
     def get_queryset(self):
         tags = self.request.query_params.get('tags')
         ingredients = self.request.query_params.get('ingredients')
-        queryset = self.queryset
+        queryset = self.queryset.filter(user=self.request.user)
         if tags:
             tag_ids = self._params_to_ints(tags)
-            queryset = self.queryset.filter(tags__id__in=tag_ids)
+            queryset = queryset.filter(tags__id__in=tag_ids)
         if ingredients:
             ingredient_ids = self._params_to_ints(ingredients)
-            queryset = self.queryset.filter(ingredients__id__in=ingredient_ids)
-        return queryset.filter(
-            user=self.request.user
-        ).order_by('-id').distinct()
+            queryset = queryset.filter(ingredients__id__in=ingredient_ids)
+        if tags or ingredients:
+            # The m2m joins repeat a recipe once per matching row.
+            queryset = queryset.distinct()
+        if self.action == 'list':
+            queryset = queryset.only(*serializers.RECIPE_LIST_FIELDS)
+        if self.action in ('list', 'retrieve'):
+            # Writes drop the prefetch cache, so only reads prefetch.
+            queryset = queryset.prefetch_related(
+                Prefetch('tags', queryset=Tag.objects.only('id', 'name')),
+                Prefetch(
+                    'ingredients',
+                    queryset=Ingredient.objects.only('id', 'name'),
+                ),
+            )
+        return queryset.order_by('-id')
 
     def get_serializer_class(self):
-        if self.action == 'list':
-            return serializers.RecipeSerializer
-        elif self.action == 'upload_image':
-            return serializers.RecipeImageSerializer
-        else:
-            return self.serializer_class
+        return self._serializer_map.get(self.action, self.serializer_class)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -92,6 +109,8 @@ class BaseRecipeAttrViewset(mixins.ListModelMixin,
 
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
+    # Name of the Recipe m2m field pointing at this viewset's model.
+    recipe_relation = None
 
     def get_queryset(self):
         assigned_only = bool(
@@ -99,19 +118,23 @@ class BaseRecipeAttrViewset(mixins.ListModelMixin,
         )
         queryset = self.queryset
         if assigned_only:
-            queryset = queryset.filter(recipe__isnull=False)
+            queryset = queryset.filter(Exists(Recipe.objects.filter(
+                **{self.recipe_relation: OuterRef('pk')}
+            )))
         return queryset.filter(
             user=self.request.user
-        ).order_by('-name').distinct()
+        ).order_by('-name')
 
 
 class TagViewSet(BaseRecipeAttrViewset):
 
     serializer_class = serializers.TagSerializer
     queryset = Tag.objects.all()
+    recipe_relation = 'tags'
 
 
 class IngredientViewSet(BaseRecipeAttrViewset):
 
     serializer_class = serializers.IngredientSerializer
     queryset = Ingredient.objects.all()
+    recipe_relation = 'ingredients'
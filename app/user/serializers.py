@@ -6,8 +6,11 @@ from django.utils.translation import gettext as _
 
 from rest_framework import serializers
 
+from core.serializers import CachedFieldsSerializerMixin
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(CachedFieldsSerializerMixin,
+                     serializers.ModelSerializer):
 
     class Meta:
         model = get_user_model()
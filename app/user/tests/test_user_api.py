@@ -1,15 +1,22 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from user.serializers import PasswordChangeSerializer
+from user.views import PasswordChangeViewset
+
 CREATE_USER_URL = reverse('user:create')
 TOKEN_URL = reverse('user:token')
 ME_URL = reverse('user:me')
 
 
+def change_password_url(email):
+    return reverse('user:change-password', args=[email])
+
+
 def create_user(**params):
     return get_user_model().objects.create_user(**params)
 
@@ -94,16 +101,6 @@ class publicUserApiTests(TestCase):
         self.assertNotIn('token', res.data)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
-    def test_create_token_blank_password(self):
-
-        payload = {
-            'email': 'test@example.com',
-            'password': '',
-        }
-        res = self.client.post(TOKEN_URL, payload)
-        self.assertNotIn('token', res.data)
-        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
-
     # def test_change_user_password(self):
 
     #     user =create_user(email = 'test@example.com', password = 'test123')
@@ -114,6 +111,30 @@ class publicUserApiTests(TestCase):
 
     #     self.assertEqual(res.status_code,status.HTTP_200_OK)
 
+    def test_change_password_user_not_found(self):
+        payload = {'password': 'test12345'}
+
+        res = self.client.patch(
+            change_password_url('missing@example.com'), payload)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PublicUserApiNoDatabaseTests(SimpleTestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_create_token_blank_password(self):
+
+        payload = {
+            'email': 'test@example.com',
+            'password': '',
+        }
+        res = self.client.post(TOKEN_URL, payload)
+        self.assertNotIn('token', res.data)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_retrieve_user_unauthorized(self):
 
         res = self.client.get(ME_URL)
@@ -150,8 +171,39 @@ class privateUserApiTests(TestCase):
         payload = {'name': 'Updated name', 'password': 'test12345'}
         res = self.client.patch(ME_URL, payload)
 
-        self.user.refresh_from_db()
+        self.user.refresh_from_db(fields=['name', 'password'])
 
         self.assertEqual(self.user.name, payload['name'])
         self.assertTrue(self.user.check_password(payload['password']))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class PasswordChangeViewsetTests(TestCase):
+
+    def test_get_object_loads_user_once(self):
+        user = create_user(email='test@example.com', password='test123')
+        view = PasswordChangeViewset(kwargs={'email': user.email})
+
+        with self.assertNumQueries(1):
+            first = view.get_object()
+            second = view.get_object()
+
+        self.assertIs(first, second)
+        self.assertEqual(first.pk, user.pk)
+
+    def test_password_change_keeps_deferred_columns(self):
+        user = create_user(
+            email='test@example.com',
+            password='test123',
+            name='Test name',
+        )
+        view = PasswordChangeViewset(kwargs={'email': user.email})
+        payload = {'password': 'test12345'}
+
+        serializer = PasswordChangeSerializer(view.get_object(), data=payload)
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+
+        user.refresh_from_db(fields=['name', 'password'])
+        self.assertEqual(user.name, 'Test name')
+        self.assertTrue(user.check_password(payload['password']))
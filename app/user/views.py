@@ -32,6 +32,9 @@ class PasswordChangeViewset(generics.UpdateAPIView):
     serializer_class = PasswordChangeSerializer
 
     def get_object(self):
-        email = str(self.kwargs['email'])
-        user = User.objects.get(email=email)
-        return user
+        if not hasattr(self, '_user'):
+            self._user = generics.get_object_or_404(
+                User.objects.only('id', 'email', 'password'),
+                email=str(self.kwargs['email']),
+            )
+        return self._user